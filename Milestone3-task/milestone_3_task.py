@@ -37,19 +37,19 @@ df_similarity = pd.DataFrame(
     columns=jd_skills
 )
 #---------------------------------------------------------------------------
-#12 to 14. Match, Partial, Missing Skills
-matched, partial, missing = [], [], []
-
-for jd in jd_skills:
-    max_score = df_similarity[jd].max()
-    best_match = df_similarity[jd].idxmax()
-
-    if max_score >= 0.8:
-        matched.append((jd, best_match, max_score))
-    elif max_score >= 0.5:
-        partial.append((jd, best_match, max_score))
-    else:
-        missing.append(jd)
+#12 to 14. Match, Partial, Missing Skills (vectorized over the whole matrix)
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from similarity import classify_gaps, category_thresholds
+
+def gap_lists(gaps):
+    matched = [(jd_skills[i], resume_skills[gaps.best[i]], float(gaps.score[i])) for i in gaps.matched]
+    partial = [(jd_skills[i], resume_skills[gaps.best[i]], float(gaps.score[i])) for i in gaps.partial]
+    missing = [jd_skills[i] for i in gaps.missing]
+    return matched, partial, missing
+
+gaps = classify_gaps(similarity_matrix.T, match_threshold=0.8, partial_threshold=0.5)
+matched, partial, missing = gap_lists(gaps)
 #------------------------------------------------------------------
 #15.Save Skill Gap Report (JSON)
 import json
@@ -88,34 +88,61 @@ def normalize(skill):
 model2 = SentenceTransformer("paraphrase-MiniLM-L3-v2")
 emb2 = model2.encode(resume_skills)
 #--------------------------------------------------------------------------------------
-#22. Cache Embeddings
-embedding_cache = {}
+#22. Cache Embeddings (memory-mapped store on disk, shared by every process)
+from embeddings import EmbeddingStore
+
+embedding_store = EmbeddingStore(model_name="all-MiniLM-L6-v2", encode=model.encode)
 
 def get_embedding(skill):
-    if skill not in embedding_cache:
-        embedding_cache[skill] = model.encode(skill)
-    return embedding_cache[skill]
+    return embedding_store.get_embedding(skill)
 #-------------------------------------------------------------------------------------------
-#23. Full Pipeline
+#23. Full Pipeline (stored float32 embeddings, one matrix multiply, raw arrays)
+from similarity import SimilarityEngine
+
+similarity_engine = SimilarityEngine(embedding_store)
+similarity_engine.add_taxonomy()
+
 def skill_gap_pipeline(resume_skills, jd_skills):
     resume_skills = clean_skills(resume_skills)
     jd_skills = clean_skills(jd_skills)
 
-    res_emb = model.encode(resume_skills)
-    jd_emb = model.encode(jd_skills)
+    sim = similarity_engine.similarity(resume_skills, jd_skills)
+    return sim, resume_skills, jd_skills
 
-    sim = cosine_similarity(res_emb, jd_emb)
+def similarity_frame(sim, resume_skills, jd_skills):
+    # Reporting only: label the raw matrix for display/export
     return pd.DataFrame(sim, index=resume_skills, columns=jd_skills)
 #--------------------------------------------------------------------------------------------------
-#24. Top-3 Resume Skills for Each JD Skill
-top3 = {}
+#24. Top-3 Resume Skills for Each JD Skill (one argpartition over the matrix)
+from similarity import top_k
 
-for jd in jd_skills:
-    top3[jd] = df_similarity[jd].nlargest(3).to_dict()
+best3 = top_k(similarity_matrix.T, k=3)
+top3 = {
+    jd: {resume_skills[i]: float(score) for i, score in zip(indices, scores)}
+    for jd, indices, scores in zip(jd_skills, best3.indices, best3.scores)
+}
 #---------------------------------------------------------------------------------------
 #25. Different Thresholds
 tech_threshold = 0.75
 soft_threshold = 0.6
+
+# Each JD skill is matched at its taxonomy category's threshold (unknown skills count as technical)
+from taxonomy import read_taxonomy
+skill_categories = dict(read_taxonomy())
+jd_thresholds = category_thresholds([skill_categories.get(s, "technical") for s in jd_skills],
+                                    {"technical": tech_threshold, "soft": soft_threshold})
+category_gaps = classify_gaps(similarity_matrix.T, match_threshold=jd_thresholds, partial_threshold=0.5)
+category_matched, category_partial, category_missing = gap_lists(category_gaps)
+
+report["category_thresholds"] = {
+    "thresholds": {"technical": tech_threshold, "soft": soft_threshold},
+    "matched": category_matched,
+    "partial": category_partial,
+    "missing": category_missing
+}
+
+with open("skill_gap_report.json", "w") as f:
+    json.dump(report, f, indent=4)
 #---------------------------------------------------------------------------------
 #26. Overall Alignment Score
 overall_score = df_similarity.max(axis=0).mean()
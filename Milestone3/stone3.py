@@ -4,55 +4,55 @@
 # =========================================
 
 from flask import Flask, render_template_string
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import matplotlib.pyplot as plt
 import pandas as pd
 import os
+import sys
+
+# Shared helpers live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing import detect_type, iter_pages, iter_lines
+from skills import extract_line_skills
+import tfidf
+from similarity import classify_gaps
 
 # -----------------------------------------
-# 1. SKILLS (FROM MILESTONE 2 OUTPUT)
+# 1. SKILLS (SAME ENGINE AS THE OTHER APPS)
 # -----------------------------------------
-resume_skills = [
-    "python", "sql", "machine learning",
-    "communication", "data analysis", "nosql"
-]
+UPLOADS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
+RESUME_PATH = os.environ.get("RESUME_PATH", os.path.join(UPLOADS, "Resume_2_Anjali_Reddy.txt"))
+JD_PATH = os.environ.get("JD_PATH", os.path.join(UPLOADS, "JD_2_Data_Analyst_TCS.txt"))
+
+def document_skills(path):
+    ftype = detect_type(path, path)
+    lines = iter_lines(iter_pages(path, ftype), ftype)
+    tech, soft, _ = extract_line_skills(lines)
+    return tech + soft
 
-jd_skills = [
-    "python", "sql", "deep learning",
-    "aws cloud", "communication", "leadership"
-]
+resume_skills = document_skills(RESUME_PATH)
+jd_skills = document_skills(JD_PATH)
 
 # -----------------------------------------
 # 2. TF-IDF VECTORIZATION
 # -----------------------------------------
-all_skills = resume_skills + jd_skills
-vectorizer = TfidfVectorizer()
-tfidf_matrix = vectorizer.fit_transform(all_skills)
-resume_vectors = tfidf_matrix[:len(resume_skills)]
-jd_vectors = tfidf_matrix[len(resume_skills):]
+# Fitted once over the skill taxonomy and persisted; only transform() runs here
+vectorizer, vectorizer_version = tfidf.load_vectorizer()
 
 # -----------------------------------------
 # 3. SIMILARITY MATRIX
 # -----------------------------------------
-similarity_matrix = cosine_similarity(jd_vectors, resume_vectors)
+similarity_matrix = tfidf.similarity(vectorizer, jd_skills, resume_skills)
 df = pd.DataFrame(similarity_matrix, index=jd_skills, columns=resume_skills)
 
 # -----------------------------------------
 # 4. SKILL GAP ANALYSIS
 # -----------------------------------------
-matched, partial, missing = [], [], []
-for skill, row in df.iterrows():
-    max_score = row.max()
-    if max_score >= 0.75:
-        matched.append(skill)
-    elif max_score >= 0.40:
-        partial.append(skill)
-    else:
-        missing.append(skill)
-
+gaps = classify_gaps(similarity_matrix, match_threshold=0.75, partial_threshold=0.40)
+matched = [jd_skills[i] for i in gaps.matched]
+partial = [jd_skills[i] for i in gaps.partial]
+missing = [jd_skills[i] for i in gaps.missing]
 
-overall_match = round(df.max(axis=1).sum() / len(jd_skills) * 100, 2)
+overall_match = round(float(gaps.score.sum()) / len(jd_skills) * 100, 2)
 
 # -----------------------------------------
 # 5. CREATE STATIC FOLDER
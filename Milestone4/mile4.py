@@ -3,11 +3,15 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
-import PyPDF2
-import docx
-import re
 from collections import Counter
 import io
+import os
+import sys
+
+# Shared helpers live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from preprocessing import detect_type, read_file, clean_lines
+from skills import weighted_skill_counts
 
 # Page configuration
 st.set_page_config(page_title="Skill Gap Analysis Dashboard", layout="wide", initial_sidebar_state="expanded")
@@ -66,63 +70,23 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Helper Functions
-def extract_text_from_pdf(file):
-    """Extract text from PDF file"""
-    pdf_reader = PyPDF2.PdfReader(file)
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
-    return text
-
-def extract_text_from_docx(file):
-    """Extract text from DOCX file"""
-    doc = docx.Document(file)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
-
-def extract_text_from_txt(file):
-    """Extract text from TXT file"""
-    return file.read().decode('utf-8')
-
 def extract_text(file):
     """Extract text based on file type"""
-    if file.name.endswith('.pdf'):
-        return extract_text_from_pdf(file)
-    elif file.name.endswith('.docx'):
-        return extract_text_from_docx(file)
-    elif file.name.endswith('.txt'):
-        return extract_text_from_txt(file)
-    else:
-        return ""
+    # Same extraction and cleaning as the Flask apps, so every UI sees the same text
+    ftype = detect_type(file, file.name)
+    return "\n".join(clean_lines(read_file(file, ftype), ftype))
 
 def extract_skills(text):
     """Extract skills from text"""
-    # Common technical skills to look for
-    skill_keywords = [
-        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift',
-        'machine learning', 'deep learning', 'artificial intelligence', 'ai',
-        'data science', 'data analysis', 'statistics', 'sql', 'nosql', 'mongodb',
-        'postgresql', 'mysql', 'tensorflow', 'pytorch', 'keras', 'scikit-learn',
-        'pandas', 'numpy', 'matplotlib', 'aws', 'azure', 'gcp', 'docker',
-        'kubernetes', 'git', 'agile', 'scrum', 'project management', 'communication',
-        'leadership', 'teamwork', 'problem solving', 'react', 'angular', 'vue',
-        'node.js', 'django', 'flask', 'rest api', 'graphql', 'html', 'css',
-        'excel', 'powerpoint', 'tableau', 'power bi', 'spark', 'hadoop',
-        'nlp', 'computer vision', 'devops', 'ci/cd', 'jenkins', 'linux'
-    ]
-    
-    text_lower = text.lower()
+    # Same engine and taxonomy as the Flask apps (skills_taxonomy.csv); a
+    # mention under Experience counts more than one under Hobbies
+    counts = weighted_skill_counts(text.split("\n"))
     found_skills = {}
     
-    for skill in skill_keywords:
-        # Count occurrences
-        count = len(re.findall(r'\b' + re.escape(skill) + r'\b', text_lower))
-        if count > 0:
-            # Estimate proficiency based on frequency (normalized to 100)
-            proficiency = min(100, 50 + (count * 10))
-            found_skills[skill.title()] = proficiency
+    for skill, count in counts.items():
+        # Estimate proficiency based on section-weighted frequency (normalized to 100)
+        proficiency = min(100, round(50 + (count * 10)))
+        found_skills[skill.title()] = proficiency
     
     return found_skills
 
@@ -0,0 +1,45 @@
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# -------------------------------
+# Admission settings
+# -------------------------------
+WORKERS = os.cpu_count() or 1       # uploads processed at the same time
+QUEUE_SIZE = 2 * WORKERS            # admitted uploads allowed to wait for a worker
+MAX_UPLOAD_BYTES = 16 * 1024 * 1024 # whole request body, enforced by Flask (413)
+RETRY_AFTER = 5                     # seconds, sent with 503 rejections
+
+class Overloaded(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+class UploadQueue:
+    """Bounded worker pool: at most workers running and queue_size waiting"""
+
+    def __init__(self, workers=WORKERS, queue_size=QUEUE_SIZE):
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+    @contextmanager
+    def slot(self):
+        """Hold a place for one request, rejecting at once when none is left"""
+        if not self.slots.acquire(blocking=False):
+            raise Overloaded()
+        try:
+            yield
+        finally:
+            self.slots.release()
+
+    def run(self, fn, *args):
+        with self.slot():
+            return self.pool.submit(fn, *args).result()
+
+# -------------------------------
+# Flask wiring
+# -------------------------------
+def init_app(app):
+    app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
+
+    @app.errorhandler(Overloaded)
+    def overloaded(e):
+        return "Server busy, please retry shortly.", 503, {"Retry-After": str(RETRY_AFTER)}
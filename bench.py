@@ -0,0 +1,151 @@
+# =========================================
+# Micro-benchmarks over the sample uploads
+# python bench.py docx|skills|phrase|engine [--folder Milestone3/uploads] [--repeat 50]
+# =========================================
+import os, re, sys, time, argparse, tracemalloc
+from preprocessing import file_type, read_file, clean_lines
+from matcher import SkillMatcher
+
+def measure(fn, repeat):
+    """Mean wall time (ms) over repeat calls and peak traced memory (KB) of one call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+def sample_files(folder, ftype):
+    return [os.path.join(folder, n) for n in sorted(os.listdir(folder)) if file_type(n) == ftype]
+
+# -------------------------------
+# DOCX: streaming XML vs python-docx
+# -------------------------------
+def python_docx_text(path):
+    import docx
+    return "\n".join(p.text for p in docx.Document(path).paragraphs)
+
+def bench_docx(folder, repeat):
+    import docx  # keep the one-off import out of the first timing
+    for path in sample_files(folder, "DOCX"):
+        stream_ms, stream_kb = measure(lambda: read_file(path, "DOCX"), repeat)
+        dom_ms, dom_kb = measure(lambda: python_docx_text(path), repeat)
+        same = set(clean_lines(python_docx_text(path), "DOCX")) <= set(clean_lines(read_file(path, "DOCX"), "DOCX"))
+        print(f"{os.path.basename(path):45} stream {stream_ms:7.2f} ms {stream_kb:8.1f} KB | "
+              f"python-docx {dom_ms:7.2f} ms {dom_kb:8.1f} KB | covers python-docx: {same}")
+
+# -------------------------------
+# Skills: single-scan trie vs per-keyword regex vs PhraseMatcher
+# -------------------------------
+def regex_counts(skills, text):
+    """The old mile4 approach: one \\b-anchored regex scan per skill"""
+    text_lower = text.lower()
+    return {s: len(re.findall(r'\b' + re.escape(s) + r'\b', text_lower)) for s in skills}
+
+def bench_skills(folder, repeat):
+    import taxonomy
+    paths = [os.path.join(folder, n) for n in sorted(os.listdir(folder)) if file_type(n) != "NA"]
+    text = "\n".join(read_file(p, file_type(p)) for p in paths)
+    base = [skill for skill, _ in taxonomy.read_taxonomy()]
+    print(f"{len(paths)} sample files, {len(text)} characters")
+
+    for size in (len(base), 1000, 5000):
+        keywords = base + [f"synthetic skill {i}" for i in range(size - len(base))]
+        matcher = SkillMatcher(keywords)
+        runs = max(1, repeat * len(base) // size)
+        regex_ms, _ = measure(lambda: regex_counts(keywords, text), runs)
+        trie_ms, _ = measure(lambda: matcher.count(text), runs)
+        print(f"{size:5} skills: regex loop {regex_ms:8.2f} ms | trie {trie_ms:6.2f} ms")
+
+    found, expected = SkillMatcher(base).count(text), regex_counts(base, text)
+    diff = {s: (expected[s], found[s]) for s in base if expected[s] != found[s]}
+    print("differences vs regex (regex, trie):", diff or "none")
+
+    # PhraseMatcher needs only a tokenizer for LOWER matching, so no model download
+    import spacy
+    from spacy.matcher import PhraseMatcher
+    nlp = spacy.blank("en")
+    phrase = PhraseMatcher(nlp.vocab, attr="LOWER")
+    phrase.add("SKILL", [nlp.make_doc(s) for s in base])
+    phrase_ms, _ = measure(lambda: phrase(nlp.make_doc(text.lower())), repeat)
+    print(f"PhraseMatcher ({len(base)} skills, tokenizer + match): {phrase_ms:.2f} ms")
+
+# -------------------------------
+# PhraseMatcher: tokenizer only vs full spaCy pipeline
+# -------------------------------
+def bench_phrase(folder, repeat):
+    import skills
+    skills.warmup()
+    paths = [os.path.join(folder, n) for n in sorted(os.listdir(folder)) if file_type(n) != "NA"]
+    for path in paths:
+        text = read_file(path, file_type(path))
+        fast_ms, _ = measure(lambda: skills.extract_skills(text), repeat)
+        full_ms, _ = measure(lambda: skills.extract_skills(text, fast=False), repeat)
+        same = skills.extract_skills(text) == skills.extract_skills(text, fast=False)
+        print(f"{os.path.basename(path):45} tokenizer {fast_ms:7.2f} ms | full pipeline {full_ms:7.2f} ms | identical: {same}")
+
+# -------------------------------
+# Shared engine: consistency across front ends and file formats, throughput
+# -------------------------------
+# Texts every front end must find exactly these skills in: (file type, text, skills)
+ENGINE_CASES = [
+    ("TXT", "C++/Java", {"c++", "java"}),
+    ("TXT", "C#/.NET and Python,SQL", {"c#", "python", "sql"}),
+    ("TXT", "C++,Java; CI/CD", {"c++", "java", "ci/cd"}),
+    # A compound wrapped at a PDF line end is still the skill it names
+    ("PDF", "Strong problem-\nsolving with scikit-\nlearn", {"problem solving", "scikit-learn"}),
+]
+
+def check_cases(skills):
+    ok = True
+    for ftype, text, expected in ENGINE_CASES:
+        lines = clean_lines(text, ftype)
+        tech, soft, _ = skills.extract_line_skills(lines)
+        found = {"lines": set(tech) | set(soft), "count": set(skills.count_skills("\n".join(lines))),
+                 "sections": set(skills.weighted_skill_counts(lines))}
+        wrong = {path: sorted(got) for path, got in found.items() if got != expected}
+        ok &= not wrong
+        print(f"{ftype} {text!r:45} expected {sorted(expected)}: {wrong or 'ok'}")
+    return ok
+
+def bench_engine(folder, repeat):
+    """Returns False when front ends or formats disagree, so it can gate a change"""
+    import skills
+    skills.warmup()
+    paths = [os.path.join(folder, n) for n in sorted(os.listdir(folder)) if file_type(n) != "NA"]
+    docs = {p: clean_lines(read_file(p, file_type(p)), file_type(p)) for p in paths}
+
+    agree = check_cases(skills)
+    by_stem = {}
+    for path, lines in docs.items():
+        # project.py / stone3.py match lines page by page, mile4.py counts section hits
+        tech, soft, _ = skills.extract_line_skills(lines)
+        counted = set(skills.weighted_skill_counts(lines))
+        same = set(tech) | set(soft) == counted
+        agree &= same
+        by_stem.setdefault(os.path.splitext(os.path.basename(path))[0], []).append(counted)
+        print(f"{os.path.basename(path):45} {len(counted):3} skills | front ends agree: {same}")
+
+    split = sorted(stem for stem, found in by_stem.items() if any(f != found[0] for f in found))
+    print("formats that disagree:", split or "none")
+
+    chars = sum(len(line) + 1 for lines in docs.values() for line in lines)
+    ms, kb = measure(lambda: [skills.extract_line_skills(lines) for lines in docs.values()], repeat)
+    print(f"{len(docs)} documents, {chars} characters: {ms:.2f} ms per pass, "
+          f"{len(docs) / ms * 1000:.0f} docs/s, {chars / ms / 1000:.2f} MB/s, peak {kb:.1f} KB")
+    return agree and not split
+
+BENCHMARKS = {"docx": bench_docx, "skills": bench_skills, "phrase": bench_phrase, "engine": bench_engine}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a benchmark over the sample uploads")
+    parser.add_argument("name", choices=sorted(BENCHMARKS))
+    parser.add_argument("--folder", default=os.path.join("Milestone3", "uploads"))
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    # Benchmarks that check results return False on a mismatch
+    if BENCHMARKS[args.name](args.folder, args.repeat) is False:
+        sys.exit(1)
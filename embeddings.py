@@ -0,0 +1,208 @@
+import os, threading
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+# sentence-transformers is only imported when a missing skill has to be encoded
+
+# -------------------------------
+# Store settings
+# -------------------------------
+STORE_FOLDER = "embedding_store"
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Rows preallocated in a new matrix; it doubles whenever it fills up
+INITIAL_ROWS = 1024
+
+_lock = threading.Lock()
+
+def skill_key(skill):
+    """Lowercased, whitespace-collapsed skill, as clean_skills stores them"""
+    return " ".join(skill.lower().split())
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+class _StoreLock:
+    """Exclusive lock on a side file, shared by every process appending to the store"""
+
+    def __init__(self, path):
+        self.path = path + ".lock"
+
+    def __enter__(self):
+        _lock.acquire()
+        self.f = open(self.path, "a")
+        if fcntl:
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+        _lock.release()
+
+# -------------------------------
+# Embedding store
+# -------------------------------
+class EmbeddingStore:
+    """Skill embeddings in a memory-mapped float32 .npy plus a skill -> row index
+
+    vectors.npy holds one L2-normalized row per skill (cosine similarity is
+    a dot product) and skills.txt holds the skills, one per line, in row
+    order. Both are append-only. Every process maps the matrix read-only,
+    so the rows live once in the page cache, and restarts or new workers
+    start warm. Missing skills are encoded in one batch and appended under
+    a file lock. Rows are written before their index line, so readers never
+    see a skill whose row is not there yet.
+    """
+
+    def __init__(self, folder=STORE_FOLDER, model_name=MODEL_NAME, encode=None):
+        self.folder = os.path.join(folder, model_name.replace("/", "__"))
+        self.model_name = model_name
+        self.matrix_path = os.path.join(self.folder, "vectors.npy")
+        self.index_path = os.path.join(self.folder, "skills.txt")
+        self._encode = encode
+        self.index = {}
+        self.skills = []
+        self._offset = 0
+        self._matrix = None
+        self._mapped_rows = 0
+        os.makedirs(self.folder, exist_ok=True)
+        self._refresh()
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return skill_key(skill) in self.index
+
+    def encode(self, skills):
+        if self._encode is None:
+            from sentence_transformers import SentenceTransformer
+            self._encode = SentenceTransformer(self.model_name).encode
+        return self._encode(skills)
+
+    # ---- reading ----
+    def _refresh(self):
+        """Pick up index lines appended by other processes (a torn last line is skipped)"""
+        try:
+            size = os.path.getsize(self.index_path)
+        except OSError:
+            return
+        if size <= self._offset:
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            self.index[line] = len(self.skills)
+            self.skills.append(line)
+        self._offset += len(complete)
+
+    def _mapped(self, rows):
+        """The read-only matrix mapping, remapped if rows may be missing from it
+
+        A grown matrix is a new file, so rows appended after the growth are
+        not in an older mapping even when they fit its shape. Rows indexed
+        when the file was mapped are always there; for any later row the
+        file is remapped, which also picks up growth by other processes.
+        """
+        if self._matrix is None or rows > self._mapped_rows:
+            self._matrix = np.load(self.matrix_path, mmap_mode="r")
+            # Index lines are written after their rows, so every row indexed
+            # by now is in the file just mapped
+            self._mapped_rows = len(self.skills)
+        return self._matrix
+
+    @property
+    def matrix(self):
+        """Read-only (len(self), dim) view of every stored row"""
+        self._refresh()
+        if not self.skills:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._mapped(len(self.skills))[:len(self.skills)]
+
+    def rows(self, skills):
+        """Row number of every skill, encoding and appending the missing ones first"""
+        keys = [skill_key(s) for s in skills]
+        if any(k not in self.index for k in keys):
+            self._refresh()
+            missing = list(dict.fromkeys(k for k in keys if k not in self.index))
+            if missing:
+                self.add(missing)
+        return np.fromiter((self.index[k] for k in keys), dtype=np.intp, count=len(keys))
+
+    def get(self, skills):
+        """(len(skills), dim) float32 matrix of the skills' embeddings"""
+        rows = self.rows(skills)
+        return self._mapped(len(self.skills))[rows]
+
+    def get_embedding(self, skill):
+        """One skill's embedding, a read-only view into the mapped matrix"""
+        row = self.rows([skill])[0]
+        return self._mapped(len(self.skills))[row]
+
+    # ---- writing ----
+    def add(self, skills):
+        """Encode skills not stored yet and append them; returns how many were added"""
+        keys = list(dict.fromkeys(skill_key(s) for s in skills))
+        keys = [k for k in keys if k and k not in self.index]
+        if not keys:
+            return 0
+        # Encoding is the slow part, so it happens before taking the lock
+        vectors = dict(zip(keys, _normalize(self.encode(keys))))
+        with _StoreLock(self.index_path):
+            self._refresh()
+            keys = [k for k in keys if k not in self.index]
+            if not keys:
+                return 0
+            self._truncate_torn_line()
+            start = len(self.skills)
+            matrix = self._writable(start + len(keys), len(next(iter(vectors.values()))))
+            matrix[start:start + len(keys)] = np.stack([vectors[k] for k in keys])
+            matrix.flush()
+            del matrix
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write("".join(k + "\n" for k in keys))
+                f.flush()
+                os.fsync(f.fileno())
+            self._refresh()
+        return len(keys)
+
+    def _truncate_torn_line(self):
+        # A writer died mid-line; its row is simply overwritten
+        if os.path.exists(self.index_path) and os.path.getsize(self.index_path) > self._offset:
+            with open(self.index_path, "r+b") as f:
+                f.truncate(self._offset)
+
+    def _writable(self, rows, dim):
+        """Writable mapping with room for rows, growing the file by copy + rename"""
+        if not os.path.exists(self.matrix_path):
+            return self._create(max(rows, INITIAL_ROWS), dim)
+        matrix = np.lib.format.open_memmap(self.matrix_path, mode="r+")
+        if matrix.shape[1] != dim:
+            raise ValueError(f"{self.matrix_path} holds {matrix.shape[1]}-d vectors, got {dim}-d")
+        if matrix.shape[0] >= rows:
+            return matrix
+        capacity = matrix.shape[0]
+        while capacity < rows:
+            capacity *= 2
+        # Readers keep their mapping of the old file until they need a new row
+        grown = self._create(capacity, dim, self.matrix_path + f".{os.getpid()}.tmp")
+        grown[:len(self.skills)] = matrix[:len(self.skills)]
+        grown.flush()
+        del matrix
+        os.replace(grown.filename, self.matrix_path)
+        self._matrix = None
+        return grown
+
+    def _create(self, rows, dim, path=None):
+        return np.lib.format.open_memmap(path or self.matrix_path, mode="w+",
+                                         dtype=np.float32, shape=(rows, dim))
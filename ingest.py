@@ -0,0 +1,117 @@
+# =========================================
+# Bulk ingestion: directory -> corpus store
+# python ingest.py Milestone3/uploads --store corpus.jsonl --workers 4
+# =========================================
+import os, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+from preprocessing import file_type, detect_type, iter_pages, iter_lines
+from parse_cache import file_key
+from skills import extract_line_skills
+
+# -------------------------------
+# Corpus store (one JSON record per line)
+# -------------------------------
+def ingested_hashes(store):
+    """Hashes already in the store; a torn last line from a crash is ignored"""
+    hashes = set()
+    if not os.path.exists(store):
+        return hashes
+    with open(store, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                hashes.add(json.loads(line)["hash"])
+            except (ValueError, KeyError):
+                continue
+    return hashes
+
+def open_store(store):
+    """Open the store for appending, terminating a torn last line first"""
+    torn = False
+    if os.path.exists(store) and os.path.getsize(store):
+        with open(store, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    f = open(store, "a", encoding="utf-8")
+    if torn:
+        f.write("\n")
+    return f
+
+def append_record(f, record):
+    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+# -------------------------------
+# Directory walk & per-file work
+# -------------------------------
+def iter_documents(folder):
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            # Suffix picks candidates, content decides the actual type
+            if file_type(name) != "NA":
+                path = os.path.join(root, name)
+                yield path, detect_type(path, name)
+
+def ingest_file(path, ftype, key):
+    """Corpus record for one file; a file that fails to parse gets an error record instead
+
+    The error record carries the hash too, so reruns skip the file rather
+    than failing on it again, and one bad file never costs the others.
+    """
+    try:
+        return _parse_record(path, ftype, key)
+    except Exception as e:
+        return {"id": key[:16], "hash": key, "path": path, "type": ftype,
+                "error": f"{type(e).__name__}: {e}"}
+
+def _parse_record(path, ftype, key):
+    start = time.perf_counter()
+    # Already running inside a worker, so keep PDF extraction in-process
+    lines = list(iter_lines(iter_pages(path, ftype, workers=1), ftype))
+    parsed = time.perf_counter()
+    tech, soft, version = extract_line_skills(lines)
+    done = time.perf_counter()
+    return {
+        "id": key[:16],
+        "hash": key,
+        "path": path,
+        "type": ftype,
+        "lines": lines,
+        "skills": {"technical": tech, "soft": soft},
+        "taxonomy_version": version,
+        "timings_ms": {
+            "parse": round((parsed - start) * 1000, 2),
+            "skills": round((done - parsed) * 1000, 2),
+        },
+    }
+
+def ingest(folder, store, workers=None):
+    """Ingest every supported file under folder, skipping hashes already stored"""
+    seen = ingested_hashes(store)
+    jobs, skipped = [], 0
+    for path, ftype in iter_documents(folder):
+        key = file_key(path, ftype)
+        if key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+        jobs.append((path, ftype, key))
+
+    written = failed = 0
+    with open_store(store) as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        paths, ftypes, keys = zip(*jobs) if jobs else ((), (), ())
+        for record in pool.map(ingest_file, paths, ftypes, keys, chunksize=4):
+            append_record(f, record)
+            written += 1
+            failed += "error" in record
+    return written, skipped, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse a directory into a corpus store")
+    parser.add_argument("folder")
+    parser.add_argument("--store", default="corpus.jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    written, skipped, failed = ingest(args.folder, args.store, args.workers)
+    print(f"Ingested {written} documents ({failed} failed to parse), skipped {skipped} already ingested")
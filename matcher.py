@@ -0,0 +1,78 @@
+import re
+from collections import Counter
+
+# Words are runs of letters/digits; every other non-space character is its
+# own token, so "c++", "c#", "ci/cd" and "node.js" match like any other skill
+_TOKEN = re.compile(r"[^\W_]+|[^\w\s]")
+_END = ""  # trie key marking a complete skill (never a token)
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+class SkillMatcher:
+    """Token trie over every skill, matched against a document in one scan
+
+    Scan cost depends on the document length, not on the number of skills.
+    Aliases are (alias, skill) pairs whose trie leaf holds the canonical
+    skill, so "ml" is reported as "machine learning" during the same scan.
+    Pass another tokenize (e.g. spaCy's) to match token lists it produces
+    with match_tokens. Instances pickle compactly (plain dicts only).
+    """
+
+    def __init__(self, skills, tokenize=tokenize, categories=None, aliases=()):
+        self.root = {}
+        self.size = 0
+        self.alias_count = 0
+        self.categories = dict(categories or {})
+        for skill in skills:
+            self.size += self._add(tokenize(skill), skill)
+        # After the skills, so an alias never shadows a real skill's pattern
+        for alias, skill in aliases:
+            self.alias_count += self._add(tokenize(alias), skill)
+
+    def _add(self, tokens, skill):
+        """Insert a pattern for skill; the first pattern for a token sequence wins"""
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if node is self.root or _END in node:
+            return False
+        node[_END] = skill
+        return True
+
+    def __len__(self):
+        return self.size
+
+    def scan(self, tokens):
+        """Yield (skill, first token, last token + 1) for the longest match at each start
+
+        A match lying inside one already yielded is skipped, so "apache spark"
+        is one spark, not two. Partly overlapping matches are both kept.
+        """
+        root = self.root
+        n = len(tokens)
+        covered = 0
+        for i in range(n):
+            node = root.get(tokens[i])
+            j = i + 1
+            longest = None
+            while node is not None:
+                skill = node.get(_END)
+                if skill is not None:
+                    longest = skill, i, j
+                if j == n:
+                    break
+                node = node.get(tokens[j])
+                j += 1
+            if longest is not None and longest[2] > covered:
+                covered = longest[2]
+                yield longest
+
+    def match_tokens(self, tokens):
+        """Yield the skill for every match in an already tokenized (lowercased) text"""
+        for skill, _, _ in self.scan(tokens):
+            yield skill
+
+    def count(self, text):
+        """Counter of skill -> number of occurrences in text"""
+        return Counter(skill for skill, _, _ in self.scan(tokenize(text)))
@@ -0,0 +1,206 @@
+import os, re, json, time, shutil, hashlib, threading
+from preprocessing import EXTRACTOR_VERSION, open_binary, iter_pages, iter_lines, page_count
+
+# -------------------------------
+# Cache settings
+# -------------------------------
+CACHE_FOLDER = "parse_cache"
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# PDFs longer than this are previewed first and the rest loaded on demand
+PREVIEW_PAGES = 2
+
+# put() rescans the folder only when its running total goes over
+# CACHE_MAX_BYTES, or this many seconds after the last scan (other
+# processes write to the folder too)
+EVICT_INTERVAL = 60
+
+counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+# Cache bytes as of the last scan plus everything written since; None before the first scan
+_usage = {"bytes": None, "scanned": 0.0}
+_usage_lock = threading.Lock()
+
+# -------------------------------
+# Keys & storage
+# -------------------------------
+def file_key(source, ftype):
+    """SHA-256 of the file bytes, file type and extractor version"""
+    h = hashlib.sha256()
+    with open_binary(source) as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    h.update(f"|{ftype}|{EXTRACTOR_VERSION}".encode())
+    return h.hexdigest()
+
+_KEY = re.compile(r"[0-9a-f]{64}")
+
+def _entry_path(key, suffix=".json"):
+    if not _KEY.fullmatch(key):
+        raise ValueError(f"invalid cache key: {key!r}")
+    return os.path.join(CACHE_FOLDER, key + suffix)
+
+def _touch(path):
+    # mtime doubles as the LRU timestamp; evict() may have removed the file meanwhile
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _load(key, suffix=".json"):
+    path = _entry_path(key, suffix)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    _touch(path)
+    return entry
+
+def _tmp_path(path):
+    # Unique per thread, so concurrent puts of one key don't share a temp file
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def _count(entry):
+    counters["hits" if entry is not None else "misses"] += 1
+    return entry
+
+def get(key, suffix=".json"):
+    return _count(_load(key, suffix))
+
+def put(key, entry, suffix=".json"):
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    path = _entry_path(key, suffix)
+    tmp = _tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f, separators=(",", ":"))
+        size = f.tell()
+    os.replace(tmp, path)
+    _added(size)
+
+def _added(size):
+    """Account for a written entry, evicting when the cache may be over budget"""
+    with _usage_lock:
+        due = _usage["bytes"] is None or time.monotonic() - _usage["scanned"] > EVICT_INTERVAL
+        if not due:
+            _usage["bytes"] += size
+            due = _usage["bytes"] > CACHE_MAX_BYTES
+    if due:
+        evict()
+
+def evict(max_bytes=None):
+    """Remove least recently used entries until the cache fits in max_bytes (CACHE_MAX_BYTES)"""
+    if max_bytes is None:
+        max_bytes = CACHE_MAX_BYTES
+    entries = []
+    for e in os.scandir(CACHE_FOLDER):
+        if e.name.endswith((".json", ".src")):
+            # Another thread or process may have just evicted it
+            try:
+                st = e.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        counters["evictions"] += 1
+    with _usage_lock:
+        _usage.update(bytes=total, scanned=time.monotonic())
+
+def put_source(key, source):
+    """Keep the original bytes so further page ranges can be extracted later"""
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    path = _entry_path(key, ".src")
+    tmp = _tmp_path(path)
+    with open_binary(source) as src, open(tmp, "wb") as f:
+        shutil.copyfileobj(src, f)
+        size = f.tell()
+    os.replace(tmp, path)
+    _added(size)
+
+def source_path(key):
+    path = _entry_path(key, ".src")
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+def stats():
+    return dict(counters)
+
+# -------------------------------
+# Cached parsing
+# -------------------------------
+def parse_cached(source, ftype):
+    """Return {"pages", "lines"} for a path, bytes or stream, extracting only on a cache miss"""
+    key = file_key(source, ftype)
+    entry = get(key)
+    if entry is None:
+        entry = _parse(source, ftype)
+        put(key, entry)
+    return entry
+
+def _parse(source, ftype):
+    pages = list(iter_pages(source, ftype))
+    return {"pages": pages, "lines": list(iter_lines(pages, ftype))}
+
+def _range_suffix(start, stop):
+    return f".p{start}-{stop}.json"
+
+def parse_preview(source, ftype, pages=PREVIEW_PAGES):
+    """Lines from the first pages of a document plus where to continue
+
+    Returns (key, lines, next_page). next_page is None when lines already
+    cover the whole document (not a PDF, or a short PDF); otherwise the
+    bytes are kept so parse_range can extract the remaining pages. Previews
+    are cached like full parses, so a re-upload extracts nothing.
+    """
+    key = file_key(source, ftype)
+    entry = _load(key)
+    if entry is not None:
+        return key, _count(entry)["lines"], None
+    preview = _load(key, _range_suffix(0, pages))
+    _count(preview)
+    if preview is None:
+        total = page_count(source, ftype)
+        if total is None or total <= pages:
+            entry = _parse(source, ftype)
+            put(key, entry)
+            return key, entry["lines"], None
+        preview = {"lines": list(iter_lines(iter_pages(source, ftype, stop=pages), ftype)), "next_page": pages}
+        put(key, preview, _range_suffix(0, pages))
+    if source_path(key) is None:
+        put_source(key, source)
+    return key, preview["lines"], preview["next_page"]
+
+def parse_range(key, ftype, start, stop=None):
+    """Lines of pages [start, stop) of a previewed document, or None if it was evicted
+
+    stop=None reads to the last page, e.g. to complete a parse that
+    results_log recorded as a preview.
+    """
+    if stop is None:
+        path = source_path(key)
+        if path is None:
+            return None
+        stop = page_count(path, ftype)
+    suffix = _range_suffix(start, stop)
+    cached = get(key, suffix)
+    if cached is not None:
+        return cached["lines"], cached["next_page"]
+    path = source_path(key)
+    if path is None:
+        return None
+    lines = list(iter_lines(iter_pages(path, ftype, start=start, stop=stop), ftype))
+    total = page_count(path, ftype)
+    next_page = stop if total is not None and stop < total else None
+    put(key, {"lines": lines, "next_page": next_page}, suffix)
+    return lines, next_page
@@ -1,57 +1,15 @@
-from flask import Flask, request, render_template_string
-import os, re, json
-import PyPDF2
-import docx
+from flask import Flask, request, render_template_string, jsonify, url_for, copy_current_request_context
+from preprocessing import EXTRACTORS, detect_type, spooled_source
+import admission
+import parse_cache
+import results_log
 
 app = Flask(__name__)
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+admission.init_app(app)
+uploads = admission.UploadQueue()
 
-# -------------------------------
-# File type detection
-# -------------------------------
-def file_type(name):
-    if name.endswith(".txt"):
-        return "TXT"
-    if name.endswith(".pdf"):
-        return "PDF"
-    if name.endswith(".docx"):
-        return "DOCX"
-    return "NA"
-
-# -------------------------------
-# Load file content
-# -------------------------------
-def read_file(path, ftype):
-    text = ""
-    if ftype == "TXT":
-        with open(path, "r", encoding="utf-8") as f:
-            text = f.read()
-
-    elif ftype == "PDF":
-        with open(path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for p in reader.pages:
-                if p.extract_text():
-                    text += p.extract_text() + "\n"
-
-    elif ftype == "DOCX":
-        d = docx.Document(path)
-        for p in d.paragraphs:
-            text += p.text + "\n"
-
-    return text
-
-# -------------------------------
-# Clean & split line by line
-# -------------------------------
-def clean_lines(text):
-    result = []
-    for line in text.split("\n"):
-        line = re.sub(r"\s+", " ", line).strip()
-        if line:
-            result.append(line)
-    return result
+# Pages extracted per "Load more" click
+MORE_PAGES = 5
 
 # -------------------------------
 # HTML UI (Colorful + Two Panels)
@@ -123,7 +81,23 @@ button {
     border-radius:5px;
     cursor:pointer;
 }
+
+.more { margin:10px 15px; }
 </style>
+<script>
+// Append the next page range of a previewed document to its panel
+function loadMore(btn) {
+    fetch(btn.dataset.url).then(function (r) { return r.json(); }).then(function (data) {
+        var body = btn.previousElementSibling;
+        (data.lines || []).forEach(function (line) {
+            var p = document.createElement("p");
+            p.textContent = line;
+            body.appendChild(p);
+        });
+        if (data.next_url) { btn.dataset.url = data.next_url; } else { btn.remove(); }
+    });
+}
+</script>
 </head>
 
 <body>
@@ -155,6 +129,7 @@ button {
                 <p>{{ line }}</p>
             {% endfor %}
         </div>
+        {% if resume_more %}<button class="more" data-url="{{ resume_more }}" onclick="loadMore(this)">Load more</button>{% endif %}
     </div>
 
     <div class="panel">
@@ -164,6 +139,7 @@ button {
                 <p>{{ line }}</p>
             {% endfor %}
         </div>
+        {% if jd_more %}<button class="more" data-url="{{ jd_more }}" onclick="loadMore(this)">Load more</button>{% endif %}
     </div>
 
 </div>
@@ -180,28 +156,59 @@ button {
 def index():
     resume = None
     jd = None
+    resume_more = jd_more = None
 
     if request.method == "POST":
-        r = request.files["resume"]
-        j = request.files["jd"]
-
-        r_path = os.path.join(UPLOAD_FOLDER, r.filename)
-        j_path = os.path.join(UPLOAD_FOLDER, j.filename)
-
-        r.save(r_path)
-        j.save(j_path)
-
-        r_text = read_file(r_path, file_type(r.filename.lower()))
-        j_text = read_file(j_path, file_type(j.filename.lower()))
-
-        resume = clean_lines(r_text)
-        jd = clean_lines(j_text)
-
-        # Save JSON output
-        with open("parsed_output.json", "w", encoding="utf-8") as f:
-            json.dump({"resume": resume, "job_description": jd}, f, indent=4)
-
-    return render_template_string(HTML, resume=resume, jd=jd)
+        # The queue admits (or rejects with 503) before the upload body is read
+        (resume, resume_more, resume_rest), (jd, jd_more, jd_rest) = uploads.run(
+            copy_current_request_context(parse_uploads))
+
+        # Append to the shared results log (one JSON line per request). A long
+        # PDF is logged as its preview plus where the rest is cached:
+        # parse_cache.parse_range(key, type, next_page) returns the other lines
+        results_log.append({"resume": resume, "job_description": jd,
+                            "complete": resume_rest is None and jd_rest is None,
+                            "resume_rest": resume_rest, "job_description_rest": jd_rest})
+
+    return render_template_string(HTML, resume=resume, jd=jd, resume_more=resume_more, jd_more=jd_more)
+
+def parse_uploads():
+    r = request.files["resume"]
+    j = request.files["jd"]
+
+    # Parse straight from the request stream; large files spill to a temp file
+    with spooled_source(r.stream) as r_src, spooled_source(j.stream) as j_src:
+        resume = preview(r_src, detect_type(r_src, r.filename))
+        jd = preview(j_src, detect_type(j_src, j.filename))
+    return resume, jd
+
+def preview(source, ftype):
+    """Preview lines, the "Load more" URL and the cached location of the rest (both None if complete)"""
+    key, lines, next_page = parse_cache.parse_preview(source, ftype)
+    if next_page is None:
+        return lines, None, None
+    rest = {"key": key, "type": ftype, "next_page": next_page}
+    return lines, url_for("more", key=key, type=ftype, page=next_page), rest
+
+@app.route("/more/<key>")
+def more(key):
+    ftype = request.args.get("type", "")
+    start = request.args.get("page", 0, type=int)
+    if ftype not in EXTRACTORS or start < 0:
+        return jsonify({"error": "bad request"}), 400
+    try:
+        result = uploads.run(parse_cache.parse_range, key, ftype, start, start + MORE_PAGES)
+    except ValueError:
+        result = None
+    if result is None:
+        return jsonify({"error": "document no longer cached, upload it again"}), 404
+    lines, next_page = result
+    next_url = url_for("more", key=key, type=ftype, page=next_page) if next_page else None
+    return jsonify({"lines": lines, "next_url": next_url})
+
+@app.route("/cache-stats")
+def cache_stats():
+    return jsonify(parse_cache.stats())
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,319 @@
+import io, os, re, shutil, tempfile, unicodedata, zipfile
+from xml.etree import ElementTree
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from contextlib import contextmanager
+
+# PyPDF2 is imported inside its extractor so TXT/DOCX-only workers never pay for it
+
+# Bump whenever extraction or cleaning output changes (invalidates parse_cache)
+EXTRACTOR_VERSION = "6"
+
+# Lines of TXT / paragraphs of DOCX grouped into one "page"
+PAGE_LINES = 100
+
+# PDFs with at least this many pages are split across a process pool
+PDF_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_PAGES = 16
+
+# Types whose lines are soft-wrapped, so a word may continue on the next
+# line after a hyphen; TXT lines and DOCX paragraphs end at real breaks
+SOFT_WRAPPED = {"PDF"}
+
+# Uploads larger than this are spilled to a temp file instead of parsed in memory
+SPOOL_MAX_BYTES = 4 * 1024 * 1024
+
+# Bytes read from the start of a file for content sniffing
+SNIFF_BYTES = 2048
+
+# -------------------------------
+# Extractor registry
+# -------------------------------
+EXTRACTORS = {}
+SNIFFERS = []
+
+def register_extractor(ftype, sniff=None):
+    """Register a page generator fn(source, workers, start, stop) and an optional content sniffer"""
+    def wrap(fn):
+        EXTRACTORS[ftype] = fn
+        if sniff is not None:
+            SNIFFERS.append((ftype, sniff))
+        return fn
+    return wrap
+
+# -------------------------------
+# File type detection
+# -------------------------------
+def file_type(name):
+    name = name.lower()
+    if name.endswith(".txt"):
+        return "TXT"
+    if name.endswith(".pdf"):
+        return "PDF"
+    if name.endswith(".docx"):
+        return "DOCX"
+    return "NA"
+
+def sniff_type(source):
+    """Detect the file type from its leading bytes, or "NA" if nothing matches"""
+    with open_binary(source) as f:
+        head = f.read(SNIFF_BYTES)
+        for ftype, sniff in SNIFFERS:
+            f.seek(0)
+            if sniff(head, f):
+                return ftype
+    return "NA"
+
+def detect_type(source, name=""):
+    """Content sniffing first, falling back to the filename suffix"""
+    ftype = sniff_type(source)
+    return ftype if ftype != "NA" else file_type(name)
+
+def _sniff_pdf(head, f):
+    # The spec allows junk before the header, readers accept it within 1 KB
+    return b"%PDF-" in head[:1024]
+
+def _sniff_docx(head, f):
+    if not head.startswith(b"PK\x03\x04"):
+        return False
+    try:
+        return "word/document.xml" in zipfile.ZipFile(f).namelist()
+    except zipfile.BadZipFile:
+        return False
+
+def _sniff_text(head, f):
+    if b"\x00" in head:
+        return False
+    # A full head may end part-way through a multi-byte character; a shorter
+    # one is the whole file, so every byte must decode
+    for cut in range(4 if len(head) == SNIFF_BYTES else 1):
+        try:
+            head[:len(head) - cut].decode("utf-8")
+            return True
+        except UnicodeDecodeError:
+            continue
+    return False
+
+# -------------------------------
+# Sources: paths, bytes or file objects
+# -------------------------------
+def is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+@contextmanager
+def open_binary(source):
+    """Open a path, bytes or binary file-like object for reading from the start"""
+    if is_path(source):
+        with open(source, "rb") as f:
+            yield f
+    elif isinstance(source, (bytes, bytearray)):
+        yield io.BytesIO(source)
+    else:
+        source.seek(0)
+        yield source
+
+@contextmanager
+def spooled_source(stream, suffix=""):
+    """Yield an upload stream as-is, or a temp file path once it exceeds SPOOL_MAX_BYTES"""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    if size <= SPOOL_MAX_BYTES:
+        yield stream
+        return
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(stream, f)
+        yield path
+    finally:
+        os.remove(path)
+
+# -------------------------------
+# Stream file content page by page
+# -------------------------------
+def join_lines(lines, size=PAGE_LINES):
+    """Group lines into page-sized text blocks"""
+    block = []
+    for line in lines:
+        block.append(line)
+        if len(block) >= size:
+            yield "\n".join(block) + "\n"
+            block = []
+    if block:
+        yield "\n".join(block) + "\n"
+
+# -------------------------------
+# Parallel PDF extraction
+# -------------------------------
+_pools = {}
+
+def _get_pool(workers):
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _pools[workers]
+
+def _pdf_page_range(path, start, stop):
+    import PyPDF2
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+def _iter_pdf_parallel(path, start, stop, workers):
+    """Extract pages [start, stop) on the pool and yield their texts in page order"""
+    # Several chunks per worker so one slow page range doesn't stall the rest
+    size = max(1, -(-(stop - start) // (workers * 4)))
+    starts = list(range(start, stop, size))
+    stops = [min(s + size, stop) for s in starts]
+    chunks = _get_pool(workers).map(_pdf_page_range, [path] * len(starts), starts, stops)
+    for chunk in chunks:
+        yield from chunk
+
+# -------------------------------
+# Extractors (sniffers run in registration order)
+# -------------------------------
+@register_extractor("PDF", _sniff_pdf)
+def _pdf_pages(source, workers, start, stop):
+    import PyPDF2
+    with open_binary(source) as f:
+        reader = PyPDF2.PdfReader(f)
+        stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+        # Only paths can go parallel since workers reopen the file
+        if workers > 1 and stop - start >= PARALLEL_MIN_PAGES and is_path(source):
+            texts = _iter_pdf_parallel(source, start, stop, workers)
+        else:
+            texts = (reader.pages[i].extract_text() for i in range(start, stop))
+        for page_text in texts:
+            if page_text:
+                yield page_text + "\n"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_PART = re.compile(r"word/(header|footer)(\d*)\.xml$")
+
+def _docx_parts(names):
+    """Headers, then the body, then footers"""
+    found = {"header": [], "footer": []}
+    for name in names:
+        m = _DOCX_PART.match(name)
+        if m:
+            found[m.group(1)].append((int(m.group(2) or 0), name))
+    return ([n for _, n in sorted(found["header"])] + ["word/document.xml"]
+            + [n for _, n in sorted(found["footer"])])
+
+def _iter_docx_paragraphs(part):
+    """Stream paragraph texts (table cells included) out of one WordprocessingML part"""
+    for _, elem in ElementTree.iterparse(part, events=("end",)):
+        if elem.tag == _W + "p":
+            pieces = []
+            # Runs sit under hyperlinks, insertions, content controls...
+            for run in elem.iter(_W + "r"):
+                for node in run:
+                    if node.tag == _W + "t":
+                        pieces.append(node.text or "")
+                    elif node.tag == _W + "tab":
+                        pieces.append("\t")
+                    elif node.tag in (_W + "br", _W + "cr"):
+                        pieces.append("\n")
+            yield "".join(pieces)
+            # Frees the subtree and stops text-box paragraphs being read twice
+            elem.clear()
+        elif elem.tag == _W + "tbl":
+            elem.clear()
+
+def _iter_docx_text(zf):
+    for name in _docx_parts(zf.namelist()):
+        with zf.open(name) as part:
+            yield from _iter_docx_paragraphs(part)
+
+@register_extractor("DOCX", _sniff_docx)
+def _docx_pages(source, workers, start, stop):
+    with open_binary(source) as f, zipfile.ZipFile(f) as zf:
+        yield from islice(join_lines(_iter_docx_text(zf)), start, stop)
+
+@register_extractor("TXT", _sniff_text)
+def _txt_pages(source, workers, start, stop):
+    with open_binary(source) as f:
+        # Sniffing only sees the head, and a .txt name is trusted as-is, so
+        # undecodable bytes further on become U+FFFD instead of an error
+        text = io.TextIOWrapper(f, encoding="utf-8", errors="replace")
+        try:
+            yield from islice(join_lines(line.rstrip("\n") for line in text), start, stop)
+        finally:
+            text.detach()
+
+def iter_pages(source, ftype, workers=PDF_WORKERS, start=0, stop=None):
+    """Yield the document text one page at a time, extracting each page once
+
+    source may be a path, bytes or a binary file-like object. start/stop
+    select a page range; pages outside it are never extracted for PDFs.
+    Unknown types yield nothing.
+    """
+    extractor = EXTRACTORS.get(ftype)
+    if extractor is not None:
+        yield from extractor(source, workers, start, stop)
+
+def page_count(source, ftype):
+    """Number of PDF pages without extracting any text; None for other types"""
+    if ftype != "PDF":
+        return None
+    import PyPDF2
+    with open_binary(source) as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+def read_file(source, ftype, start=0, stop=None):
+    return "".join(iter_pages(source, ftype, start=start, stop=stop))
+
+# -------------------------------
+# Normalize, clean & split line by line
+# -------------------------------
+# Bullet glyphs PDFs and Word lists leave in the text (incl. Symbol/Wingdings
+# private-use code points) become spaces; invisible characters are dropped
+BULLETS = "\u2022\u2023\u2043\u2219\u25aa\u25ab\u25cf\u25e6\u25a0\u25a1\u27a2\u2756\uf0b7\uf0a7\uf0d8\uf076"
+_TRANSLATE = str.maketrans(
+    {**{b: " " for b in BULLETS}, "\u00ad": None, "\u200b": None, "\u200c": None,
+     "\u200d": None, "\ufeff": None}
+)
+# A line ending in a hyphenated word that may continue, in lowercase, on the next line
+_HYPHEN_END = re.compile(r"[^\W\d_]-$")
+
+def normalize_lines(lines, join_hyphens=False):
+    """Yield normalized, non-empty lines in one pass, optionally re-joining hyphen-wrapped words
+
+    The hyphen is kept: a wrapped compound such as "problem-" / "solving"
+    must stay a taxonomy term, and a split syllable ("manage-" / "ment")
+    can't be told apart from one without a dictionary.
+    """
+    held = None
+    for line in lines:
+        # NFKC expands ligatures (\ufb01 -> fi) and width variants; ASCII is already normal
+        if not line.isascii():
+            if not unicodedata.is_normalized("NFKC", line):
+                line = unicodedata.normalize("NFKC", line)
+            line = line.translate(_TRANSLATE)
+        line = " ".join(line.split())
+        if not line:
+            continue
+        if held is not None:
+            if line[0].islower():
+                line = held + line
+            else:
+                yield held
+            held = None
+        if join_hyphens and line[-1] == "-" and _HYPHEN_END.search(line):
+            held = line
+        else:
+            yield line
+    if held is not None:
+        yield held
+
+def iter_lines(pages, ftype=None):
+    """Yield cleaned lines from an iterable of page texts (words may span pages)
+
+    Hyphen-wrapped words are only re-joined for SOFT_WRAPPED types, where a
+    line end is a layout wrap rather than the author's.
+    """
+    return normalize_lines((line for page in pages for line in page.split("\n")),
+                           join_hyphens=ftype in SOFT_WRAPPED)
+
+def clean_lines(text, ftype=None):
+    return list(normalize_lines(text.split("\n"), join_hyphens=ftype in SOFT_WRAPPED))
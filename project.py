@@ -1,82 +1,20 @@
-import os
-os.environ["THINC_NO_TORCH"] = "1"
-
-from flask import Flask, request, render_template_string
-import PyPDF2, docx, json, re
-import spacy
-from spacy.matcher import PhraseMatcher
+import threading
+from flask import Flask, request, render_template_string, jsonify, copy_current_request_context
+from preprocessing import detect_type, spooled_source
+from skills import extract_line_skills, is_ready, start_reloader, startup_times, taxonomy_version, warmup
+import admission
+import parse_cache
 
 # -------------------------------
 # App Setup
 # -------------------------------
 app = Flask(__name__)
-UPLOAD_FOLDER = "uploads"
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-# -------------------------------
-# Load spaCy
-# -------------------------------
-nlp = spacy.load("en_core_web_sm")
-
-# -------------------------------
-# Skill Lists
-# -------------------------------
-TECHNICAL_SKILLS = [
-    "python", "java", "sql", "machine learning", "deep learning",
-    "data analysis", "nlp", "spacy", "flask", "django",
-    "html", "css", "javascript", "git", "github"
-]
-
-SOFT_SKILLS = [
-    "communication", "teamwork", "problem solving",
-    "leadership", "adaptability", "time management",
-    "critical thinking"
-]
-
-tech_matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-soft_matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-
-tech_matcher.add("TECH", [nlp(s) for s in TECHNICAL_SKILLS])
-soft_matcher.add("SOFT", [nlp(s) for s in SOFT_SKILLS])
+admission.init_app(app)
+uploads = admission.UploadQueue()
 
 # -------------------------------
 # Helper Functions
 # -------------------------------
-def file_type(name):
-    if name.endswith(".txt"): return "TXT"
-    if name.endswith(".pdf"): return "PDF"
-    if name.endswith(".docx"): return "DOCX"
-    return "NA"
-
-def read_file(path, ftype):
-    text = ""
-    if ftype == "TXT":
-        with open(path, "r", encoding="utf-8") as f:
-            text = f.read()
-    elif ftype == "PDF":
-        with open(path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
-            for p in reader.pages:
-                if p.extract_text():
-                    text += p.extract_text() + "\n"
-    elif ftype == "DOCX":
-        d = docx.Document(path)
-        for p in d.paragraphs:
-            text += p.text + "\n"
-    return text
-
-def clean_lines(text):
-    return [re.sub(r"\s+", " ", l).strip() for l in text.split("\n") if l.strip()]
-
-def extract_skills(text):
-    doc = nlp(text.lower())
-    tech, soft = set(), set()
-    for _, s, e in tech_matcher(doc):
-        tech.add(doc[s:e].text)
-    for _, s, e in soft_matcher(doc):
-        soft.add(doc[s:e].text)
-    return sorted(tech), sorted(soft)
-
 def calculate_match(resume, jd):
     if not jd:
         return 0, []
@@ -236,6 +174,7 @@ button {
 </div>
 </div>
 </div>
+<p style="text-align:center;color:#777;font-size:12px;">Skill taxonomy {{ taxonomy_version }}</p>
 {% endif %}
 
 </body>
@@ -250,29 +189,12 @@ def index():
     resume_lines = jd_lines = None
     tech_pct = soft_pct = overall = 0
     tech_matched = soft_matched = []
+    version = None
 
     if request.method == "POST":
-        r = request.files["resume"]
-        j = request.files["jd"]
-
-        r_path = os.path.join(UPLOAD_FOLDER, r.filename)
-        j_path = os.path.join(UPLOAD_FOLDER, j.filename)
-        r.save(r_path)
-        j.save(j_path)
-
-        r_text = read_file(r_path, file_type(r.filename.lower()))
-        j_text = read_file(j_path, file_type(j.filename.lower()))
-
-        resume_lines = clean_lines(r_text)
-        jd_lines = clean_lines(j_text)
-
-        r_tech, r_soft = extract_skills(r_text)
-        j_tech, j_soft = extract_skills(j_text)
-
-        tech_pct, tech_matched = calculate_match(r_tech, j_tech)
-        soft_pct, soft_matched = calculate_match(r_soft, j_soft)
-
-        overall = overall_score(tech_pct, soft_pct)
+        # The queue admits (or rejects with 503) before the upload body is read
+        (resume_lines, jd_lines, tech_pct, tech_matched,
+         soft_pct, soft_matched, overall, version) = uploads.run(copy_current_request_context(analyze_uploads))
 
     return render_template_string(
         HTML,
@@ -282,8 +204,45 @@ def index():
         soft_matched=soft_matched,
         tech_pct=tech_pct,
         soft_pct=soft_pct,
-        overall=overall
+        overall=overall,
+        taxonomy_version=version
     )
 
+def analyze_uploads():
+    r = request.files["resume"]
+    j = request.files["jd"]
+
+    # Parse straight from the request stream; large files spill to a temp file
+    with spooled_source(r.stream) as r_src, spooled_source(j.stream) as j_src:
+        r_doc = parse_cache.parse_cached(r_src, detect_type(r_src, r.filename))
+        j_doc = parse_cache.parse_cached(j_src, detect_type(j_src, j.filename))
+
+    resume_lines, jd_lines = r_doc["lines"], j_doc["lines"]
+
+    # Match on normalized lines so ligatures and hyphen breaks don't hide skills
+    # Both sides use the same matcher even if the taxonomy reloads in between
+    model = warmup()
+    r_tech, r_soft, version = extract_line_skills(resume_lines, model)
+    j_tech, j_soft, _ = extract_line_skills(jd_lines, model)
+
+    tech_pct, tech_matched = calculate_match(r_tech, j_tech)
+    soft_pct, soft_matched = calculate_match(r_soft, j_soft)
+
+    overall = overall_score(tech_pct, soft_pct)
+    return resume_lines, jd_lines, tech_pct, tech_matched, soft_pct, soft_matched, overall, version
+
+@app.route("/cache-stats")
+def cache_stats():
+    return jsonify(parse_cache.stats())
+
+@app.route("/ready")
+def ready():
+    body = {"ready": is_ready(), "startup_ms": startup_times, "taxonomy_version": taxonomy_version()}
+    return jsonify(body), (200 if body["ready"] else 503)
+
 if __name__ == "__main__":
+    # Load the model in the background; /ready reports 503 until it is done
+    threading.Thread(target=warmup, daemon=True).start()
+    # Pick up taxonomy edits without a restart
+    start_reloader()
     app.run(debug=True)
@@ -0,0 +1,73 @@
+import os, json, time, uuid, threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+# -------------------------------
+# Log settings
+# -------------------------------
+LOG_PATH = "parsed_output.jsonl"
+MAX_BYTES = 64 * 1024 * 1024
+BACKUP_COUNT = 5
+
+_lock = threading.Lock()
+
+# -------------------------------
+# Writing
+# -------------------------------
+class _FileLock:
+    """Exclusive lock on a side file, shared by every process writing the log"""
+
+    def __init__(self, path):
+        self.path = path + ".lock"
+
+    def __enter__(self):
+        _lock.acquire()
+        self.f = open(self.path, "a")
+        if fcntl:
+            fcntl.flock(self.f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl:
+            fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+        _lock.release()
+
+def _rotate(path):
+    for i in range(BACKUP_COUNT - 1, 0, -1):
+        if os.path.exists(f"{path}.{i}"):
+            os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
+
+def append(record, path=LOG_PATH):
+    """Append one record as a compact JSON line and return its request id"""
+    request_id = uuid.uuid4().hex
+    line = json.dumps({"request_id": request_id, "ts": time.time(), **record},
+                      separators=(",", ":"), ensure_ascii=False) + "\n"
+    with _FileLock(path):
+        if os.path.exists(path) and os.path.getsize(path) >= MAX_BYTES:
+            _rotate(path)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+    return request_id
+
+# -------------------------------
+# Reading
+# -------------------------------
+def iter_records(path=LOG_PATH, include_rotated=True):
+    """Stream records back oldest first, skipping lines torn by a crash"""
+    paths = [path]
+    if include_rotated:
+        paths = [f"{path}.{i}" for i in range(BACKUP_COUNT, 0, -1)] + paths
+    for p in paths:
+        if not os.path.exists(p):
+            continue
+        with open(p, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
@@ -0,0 +1,109 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+# -------------------------------
+# Section vocabulary
+# -------------------------------
+# Lines before the first recognised heading (name, contact details...)
+HEADER = "header"
+
+# Earlier entries win when a heading has several keywords, so
+# "Education History" is education and "Skills & Experience" is skills
+SECTION_KEYWORDS = [
+    ("certifications", ("certification", "certifications", "certificates", "licenses")),
+    ("education", ("education", "qualification", "qualifications", "academic", "academics")),
+    ("skills", ("skills", "skill", "competencies", "technologies", "expertise")),
+    ("experience", ("experience", "employment", "responsibilities", "internship", "internships", "history")),
+    ("projects", ("project", "projects")),
+    ("interests", ("hobbies", "interests", "activities")),
+    ("summary", ("summary", "objective", "profile", "about", "description", "overview")),
+]
+_SECTION_OF = {word: name for name, words in SECTION_KEYWORDS for word in words}
+_PRIORITY = {name: rank for rank, (name, _) in enumerate(SECTION_KEYWORDS)}
+
+# Words that may surround a keyword in a heading written without a colon
+_FILLER = {"and", "&", "of", "work", "professional", "technical", "soft", "key", "core",
+           "career", "job", "required", "relevant", "personal"}
+
+_WORD = re.compile(r"[a-z&]+")
+
+# Headings are short; longer lines are always content
+HEADING_MAX_WORDS = 5
+INLINE_HEADING_MAX_WORDS = 3
+
+Section = namedtuple("Section", "name start end")
+
+# What one mention of a skill is worth in each section: used in experience
+# or projects counts more than listed under interests. Unlisted sections
+# (the header of a document without headings, e.g. most JDs) count 1
+SECTION_WEIGHTS = {"experience": 1.5, "projects": 1.5, "education": 0.75, "interests": 0.5}
+
+# -------------------------------
+# Heading detection
+# -------------------------------
+def _section_of(words):
+    names = [_SECTION_OF[w] for w in words if w in _SECTION_OF]
+    return min(names, key=_PRIORITY.get) if names else None
+
+def heading(line):
+    """Section name if a cleaned line is a heading, else None
+
+    "Work Experience:", "EDUCATION", "Technical Skills" and the inline
+    "Skills: Python, SQL" are headings; "Email: x@y.com" and a content line
+    such as "Strong communication skills" are not.
+    """
+    head, colon, rest = line.partition(":")
+    words = _WORD.findall(head.lower())
+    if not words or len(words) > HEADING_MAX_WORDS:
+        return None
+    if colon:
+        if rest.strip() and len(words) > INLINE_HEADING_MAX_WORDS:
+            return None
+        return _section_of(words)
+    # Without a colon only all-caps or pure heading vocabulary counts
+    if head.isupper() or all(w in _SECTION_OF or w in _FILLER for w in words):
+        return _section_of(words)
+    return None
+
+# -------------------------------
+# Offset index
+# -------------------------------
+class SectionIndex:
+    """Sections of "\\n".join(lines) as character ranges, looked up by offset"""
+
+    def __init__(self, sections):
+        self.sections = sections
+        self._starts = [s.start for s in sections]
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def section_at(self, offset):
+        """Name of the section containing a character offset"""
+        i = bisect_right(self._starts, offset) - 1
+        return self.sections[i].name if i >= 0 else HEADER
+
+def segment(lines):
+    """Split clean_lines output into sections in one pass; returns (text, SectionIndex)
+
+    text is "\\n".join(lines) and every offset in the index refers to it.
+    A heading line belongs to the section it opens. Repeated headings
+    (two "Skills" blocks) give two sections with the same name.
+    """
+    sections = []
+    name, start, offset = HEADER, 0, 0
+    for line in lines:
+        found = heading(line)
+        if found is not None:
+            if offset > start:
+                sections.append(Section(name, start, offset - 1))
+            name, start = found, offset
+        offset += len(line) + 1
+    end = max(offset - 1, 0)
+    if end > start or not sections:
+        sections.append(Section(name, start, end))
+    return "\n".join(lines), SectionIndex(sections)
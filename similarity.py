@@ -0,0 +1,138 @@
+import numpy as np
+from collections import namedtuple
+import taxonomy
+from embeddings import EmbeddingStore
+
+# -------------------------------
+# Gap thresholds
+# -------------------------------
+MATCH_THRESHOLD = 0.8
+PARTIAL_THRESHOLD = 0.5
+
+# For every JD skill (row): its best resume column and score, then the row
+# numbers of the matched, partial and missing JD skills
+GapAnalysis = namedtuple("GapAnalysis", "best score matched partial missing")
+
+# Rows of the similarity matrix handled per step by top_k
+TOPK_BLOCK_ROWS = 1024
+
+# (rows, k) column indices and their scores, best first
+TopK = namedtuple("TopK", "indices scores")
+
+# -------------------------------
+# Similarity engine
+# -------------------------------
+class SimilarityEngine:
+    """Cosine similarity between skill lists as one float32 matrix multiply
+
+    Embeddings come from an EmbeddingStore, whose rows are already
+    L2-normalized float32. Nothing is renormalized or upcast per call, and
+    a resume x JD block is M[resume_rows] @ M[jd_rows].T. Results are
+    plain arrays; wrap them in a DataFrame only for reporting.
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else EmbeddingStore()
+
+    def add_taxonomy(self, path=taxonomy.TAXONOMY_PATH):
+        """Encode every taxonomy skill once (a no-op when the store already has them)"""
+        return self.store.add(skill for skill, _ in taxonomy.read_taxonomy(path))
+
+    def rows(self, skills):
+        """Store row of every skill, encoding unseen ones"""
+        return self.store.rows(skills)
+
+    def block(self, row_ids, col_ids):
+        """(len(row_ids), len(col_ids)) float32 similarities of two sets of store rows"""
+        matrix = self.store.matrix
+        return matrix[row_ids] @ matrix[col_ids].T
+
+    def similarity(self, row_skills, col_skills):
+        """(len(row_skills), len(col_skills)) float32 cosine similarities"""
+        row_ids = self.rows(row_skills)
+        col_ids = self.rows(col_skills)
+        return self.block(row_ids, col_ids)
+
+    def top_k(self, row_skills, col_skills, k=3, block_rows=TOPK_BLOCK_ROWS):
+        """TopK of col_skills positions for every row skill, never holding the full matrix
+
+        Each block of block_rows row skills is multiplied and reduced to its
+        k best columns before the next one, so memory stays at
+        block_rows x len(col_skills) however many row skills there are.
+        """
+        row_ids = self.rows(row_skills)
+        col_ids = self.rows(col_skills)
+        matrix = self.store.matrix
+        cols = matrix[col_ids].T
+        parts = [_top_k_block(matrix[row_ids[i:i + block_rows]] @ cols, k)
+                 for i in range(0, len(row_ids), block_rows)]
+        return _concat_top_k(parts, len(col_ids), k)
+
+# -------------------------------
+# Gap classification
+# -------------------------------
+def category_thresholds(categories, thresholds, default=MATCH_THRESHOLD):
+    """Per-row threshold array from each row's category, e.g. {"technical": 0.75, "soft": 0.6}"""
+    return np.fromiter((thresholds.get(c, default) for c in categories),
+                       dtype=np.float32, count=len(categories))
+
+def classify_gaps(sim, match_threshold=MATCH_THRESHOLD, partial_threshold=PARTIAL_THRESHOLD):
+    """Bucket every row of a (JD skills x resume skills) similarity matrix at once
+
+    Thresholds are scalars or per-row arrays (see category_thresholds). A
+    row is matched when its best score reaches match_threshold, partial when
+    it reaches partial_threshold, and missing otherwise. Pass sim.T for a
+    resume x JD matrix. best is -1 and score 0 when there are no columns.
+    """
+    sim = np.asarray(sim)
+    if sim.shape[1] == 0:
+        best = np.full(sim.shape[0], -1, dtype=np.intp)
+        score = np.zeros(sim.shape[0], dtype=np.float32)
+    else:
+        best = sim.argmax(axis=1)
+        score = np.take_along_axis(sim, best[:, None], axis=1)[:, 0]
+    is_match = score >= match_threshold
+    is_partial = ~is_match & (score >= partial_threshold)
+    return GapAnalysis(best, score, np.flatnonzero(is_match), np.flatnonzero(is_partial),
+                       np.flatnonzero(~is_match & ~is_partial))
+
+# -------------------------------
+# Top-k retrieval
+# -------------------------------
+def _top_k_block(sim, k):
+    k = min(k, sim.shape[1])
+    if k == 0:
+        return TopK(np.empty((sim.shape[0], 0), dtype=np.intp), np.empty((sim.shape[0], 0), sim.dtype))
+    # NaN compares false with everything, so it would fit neither side of
+    # the k-th score; rank it below every number instead
+    nan = np.isnan(sim)
+    rank = np.where(nan, -np.inf, sim) if nan.any() else sim
+    # The k-th best score of each row, then everything above it plus the
+    # first columns equal to it, so ties resolve by column like nlargest
+    kth = np.partition(rank, -k, axis=1)[:, -k, None]
+    above = rank > kth
+    tied = rank == kth
+    need = k - above.sum(axis=1, keepdims=True)
+    keep = above | (tied & (np.cumsum(tied, axis=1) <= need))
+    part = np.nonzero(keep)[1].reshape(sim.shape[0], k)
+    order = np.lexsort((part, -np.take_along_axis(rank, part, axis=1)), axis=1)
+    part = np.take_along_axis(part, order, axis=1)
+    return TopK(part, np.take_along_axis(sim, part, axis=1))
+
+def _concat_top_k(parts, cols, k):
+    if not parts:
+        k = min(k, cols)
+        return TopK(np.empty((0, k), dtype=np.intp), np.empty((0, k), dtype=np.float32))
+    return TopK(np.concatenate([p.indices for p in parts]), np.concatenate([p.scores for p in parts]))
+
+def top_k(sim, k=3, block_rows=TOPK_BLOCK_ROWS):
+    """The k best columns and scores of every row of a similarity matrix, best first
+
+    One partition per block of block_rows rows replaces a per-row
+    nlargest loop; ties keep the earlier column, as nlargest does. Rows
+    with fewer than k columns return all of them, and NaN scores rank
+    last. Pass sim.T for a resume x JD matrix to rank resume skills per JD skill.
+    """
+    sim = np.asarray(sim)
+    parts = [_top_k_block(sim[i:i + block_rows], k) for i in range(0, sim.shape[0], block_rows)]
+    return _concat_top_k(parts, sim.shape[1], k)
@@ -0,0 +1,230 @@
+import os
+os.environ["THINC_NO_TORCH"] = "1"
+
+import csv, threading, time, logging
+from collections import Counter, namedtuple
+import taxonomy
+import sections
+from preprocessing import join_lines
+
+# spaCy is imported on first use (or warmup()), so importing this module
+# stays cheap for parse-only callers. Matching only needs the language's
+# tokenizer; the trained model is loaded only for fast=False.
+LANG = "en"
+MODEL_NAME = "en_core_web_sm"
+
+# spaCy only splits "/" between letters and "#" at the end of a word, so
+# "c++/java" and "c#/.net" would stay one token each; these infixes split
+# them (and "c++,java") like the regex tokenizer in matcher.py does
+SKILL_INFIXES = [r"/", r"#", r"(?<=[+#]),"]
+
+# Skills come from a skill,category CSV compiled into a token trie; the
+# compiled artifact is reused until the file or the tokenizer changes
+TAXONOMY_PATH = taxonomy.TAXONOMY_PATH
+
+# Seconds between taxonomy file checks once start_reloader() is running
+RELOAD_INTERVAL = 10
+
+# A reload keeping less than this share of the live skills is taken for a
+# truncated or half-written file and rejected
+RELOAD_MIN_FRACTION = 0.5
+
+# Every result names the taxonomy version it was matched against
+SkillMatch = namedtuple("SkillMatch", "technical soft version")
+
+# One skill occurrence and the resume section it sits in
+SkillHit = namedtuple("SkillHit", "skill category section start end")
+
+log = logging.getLogger(__name__)
+
+# -------------------------------
+# Model lifecycle
+# -------------------------------
+# Milliseconds spent in each startup phase, filled in by warmup()
+startup_times = {}
+
+# (tokenizer-only nlp, matcher, taxonomy version, tokenizer id); replaced as a whole on reload
+_model = None
+_lock = threading.Lock()
+
+# The full MODEL_NAME pipeline, loaded on the first fast=False call
+_pipeline = None
+
+def is_ready():
+    return _model is not None
+
+def taxonomy_version():
+    return _model[2] if _model is not None else None
+
+def _tokens(doc):
+    return [t.lower_ for t in doc if not t.is_space]
+
+def _split_joined_skills(nlp):
+    from spacy.util import compile_infix_regex
+    nlp.tokenizer.infix_finditer = compile_infix_regex(list(nlp.Defaults.infixes) + SKILL_INFIXES).finditer
+    return nlp
+
+def _load_matcher(nlp, tokenizer_id):
+    return taxonomy.load_matcher(TAXONOMY_PATH, lambda s: _tokens(nlp.make_doc(s)), tokenizer_id)
+
+def warmup():
+    """Import spaCy, create the tokenizer and load the compiled skill matcher if not done yet"""
+    global _model
+    if _model is not None:
+        return _model
+    with _lock:
+        if _model is not None:
+            return _model
+        start = time.perf_counter()
+        import spacy
+        imported = time.perf_counter()
+
+        # A blank pipeline has the language's tokenizer and nothing else, so
+        # no model package has to be installed
+        nlp = _split_joined_skills(spacy.blank(LANG))
+        loaded = time.perf_counter()
+
+        # Patterns are split by the same tokenizer as the documents, so the
+        # artifact is keyed on the spaCy version and the extra infixes too
+        tokenizer_id = f"spacy-{spacy.__version__}-blank-{LANG}-{'|'.join(SKILL_INFIXES)}"
+        matcher, version = _load_matcher(nlp, tokenizer_id)
+        built = time.perf_counter()
+
+        startup_times.update({
+            "imports_ms": round((imported - start) * 1000, 2),
+            "model_load_ms": round((loaded - imported) * 1000, 2),
+            "matcher_build_ms": round((built - loaded) * 1000, 2),
+        })
+        _model = (nlp, matcher, version, tokenizer_id)
+    return _model
+
+# -------------------------------
+# Taxonomy hot reload
+# -------------------------------
+def reload_taxonomy():
+    """Rebuild the matcher if the taxonomy file changed and swap it in; returns the live version
+
+    The swap replaces one module reference, so extractions already running
+    finish on the matcher they started with. A file that compiles to no
+    skills, or to less than RELOAD_MIN_FRACTION of the live ones, raises
+    ValueError and the live matcher stays.
+    """
+    global _model
+    nlp, _, version, tokenizer_id = warmup()
+    with _lock:
+        if taxonomy.taxonomy_version(TAXONOMY_PATH, tokenizer_id) == _model[2]:
+            return _model[2]
+        matcher, new_version = _load_matcher(nlp, tokenizer_id)
+        live = len(_model[1])
+        if not len(matcher) or len(matcher) < live * RELOAD_MIN_FRACTION:
+            raise ValueError(f"{TAXONOMY_PATH} has {len(matcher)} skills, {live} are live")
+        _model = (nlp, matcher, new_version, tokenizer_id)
+    log.info("skill taxonomy reloaded: %s -> %s (%d skills)", version, new_version, len(matcher))
+    return new_version
+
+def start_reloader(interval=RELOAD_INTERVAL):
+    """Check the taxonomy file every interval seconds from a daemon thread"""
+    def watch():
+        while True:
+            time.sleep(interval)
+            try:
+                reload_taxonomy()
+            except (OSError, ValueError, csv.Error) as e:
+                # Keep serving the last good matcher until the file is fixed
+                log.warning("skill taxonomy reload failed: %s", e)
+
+    thread = threading.Thread(target=watch, daemon=True)
+    thread.start()
+    return thread
+
+def full_pipeline():
+    """The trained MODEL_NAME pipeline, only needed for fast=False"""
+    global _pipeline
+    if _pipeline is None:
+        with _lock:
+            if _pipeline is None:
+                import spacy
+                _pipeline = _split_joined_skills(spacy.load(MODEL_NAME))
+    return _pipeline
+
+# -------------------------------
+# Skill extraction
+# -------------------------------
+def _match(doc, matcher, version):
+    tech, soft = set(), set()
+    for skill in matcher.match_tokens(_tokens(doc)):
+        (soft if matcher.categories.get(skill) == "soft" else tech).add(skill)
+    return SkillMatch(sorted(tech), sorted(soft), version)
+
+def extract_skills(text, fast=True):
+    """SkillMatch of the sorted technical and soft skills found in text
+
+    The matcher only looks at lowercased tokens, so by default just the
+    tokenizer runs; fast=False runs the full pipeline and finds the same skills.
+    """
+    nlp, matcher, version, _ = warmup()
+    doc = nlp.make_doc(text.lower()) if fast else full_pipeline()(text.lower())
+    return _match(doc, matcher, version)
+
+def extract_skills_batch(texts, batch_size=64, n_process=1, fast=True, model=None):
+    """Yield a SkillMatch for each text in input order, via nlp.pipe
+
+    n_process > 1 tokenizes in worker processes; matching stays in this one.
+    The whole batch uses the matcher that was live when it started, or the
+    one in model (a warmup() result) so several calls can share a version.
+    """
+    nlp, matcher, version, _ = model or warmup()
+    if not fast:
+        nlp = full_pipeline()
+    docs = nlp.pipe((t.lower() for t in texts), batch_size=batch_size, n_process=n_process)
+    for doc in docs:
+        yield _match(doc, matcher, version)
+
+def extract_page_skills(pages, model=None):
+    """Match skills page by page instead of on one concatenated document"""
+    model = model or warmup()
+    tech, soft = set(), set()
+    for page in extract_skills_batch(pages, model=model):
+        tech.update(page.technical)
+        soft.update(page.soft)
+    return SkillMatch(sorted(tech), sorted(soft), model[2])
+
+def extract_line_skills(lines, model=None):
+    """SkillMatch for clean_lines output, matched a page of lines at a time"""
+    return extract_page_skills(join_lines(lines), model)
+
+def count_skills(text, model=None):
+    """Counter of canonical skill -> occurrences in text, in order of first occurrence"""
+    nlp, matcher, _, _ = model or warmup()
+    return Counter(matcher.match_tokens(_tokens(nlp.make_doc(text.lower()))))
+
+def _lower_keep_offsets(text):
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. "\u0130") grow when lowercased; leave those as-is
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+def extract_section_hits(lines, model=None):
+    """(SkillHit list, taxonomy version) for clean_lines output, each hit tagged with its section
+
+    Sections come from one pass over the lines and each hit is looked up in
+    the offset index, so the text is still tokenized and scanned only once.
+    """
+    nlp, matcher, version, _ = model or warmup()
+    text, index = sections.segment(lines)
+    tokens = [t for t in nlp.make_doc(_lower_keep_offsets(text)) if not t.is_space]
+    hits = []
+    for skill, i, j in matcher.scan([t.lower_ for t in tokens]):
+        start, end = tokens[i].idx, tokens[j - 1].idx + len(tokens[j - 1])
+        hits.append(SkillHit(skill, matcher.categories.get(skill, "technical"),
+                             index.section_at(start), start, end))
+    return hits, version
+
+def weighted_skill_counts(lines, model=None):
+    """Counter of skill -> mentions in clean_lines output, each weighted by its section's SECTION_WEIGHTS"""
+    hits, _ = extract_section_hits(lines, model)
+    counts = Counter()
+    for hit in hits:
+        counts[hit.skill] += sections.SECTION_WEIGHTS.get(hit.section, 1)
+    return counts
@@ -0,0 +1,103 @@
+import os, csv, pickle, hashlib, logging
+from matcher import SkillMatcher, tokenize as default_tokenize
+
+# -------------------------------
+# Taxonomy settings
+# -------------------------------
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.csv")
+
+# Bump when the compiled matcher layout changes (invalidates every artifact)
+MATCHER_FORMAT = "3"
+
+# Aliases live in an optional third column, separated by "|"
+ALIAS_SEP = "|"
+
+log = logging.getLogger(__name__)
+
+# -------------------------------
+# Loading
+# -------------------------------
+def _read_rows(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(line for line in f if line.strip() and not line.startswith("#")):
+            skill = (row.get("skill") or "").strip().lower()
+            if skill:
+                yield skill, row
+
+def read_taxonomy(path=TAXONOMY_PATH):
+    """(skill, category) rows of a skill,category[,aliases] CSV; blank and # lines are skipped"""
+    return [(skill, (row.get("category") or "technical").strip().lower())
+            for skill, row in _read_rows(path)]
+
+def read_aliases(path=TAXONOMY_PATH):
+    """(alias, skill) pairs from the aliases column, e.g. "ml|m.l." on machine learning"""
+    return [(alias.strip().lower(), skill)
+            for skill, row in _read_rows(path)
+            for alias in (row.get("aliases") or "").split(ALIAS_SEP) if alias.strip()]
+
+def taxonomy_version(path=TAXONOMY_PATH, tokenizer_id="regex"):
+    """Hash of the taxonomy bytes, matcher format and tokenizer used to compile it"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    h.update(f"|{MATCHER_FORMAT}|{tokenizer_id}".encode())
+    return h.hexdigest()[:16]
+
+# -------------------------------
+# Compiled artifact
+# -------------------------------
+def artifact_path(path, tokenizer_id):
+    return f"{path}.{hashlib.sha1(tokenizer_id.encode()).hexdigest()[:8]}.matcher.pkl"
+
+def compile_taxonomy(path=TAXONOMY_PATH, tokenize=default_tokenize):
+    """Build the matcher for a taxonomy file, aliases included"""
+    rows = read_taxonomy(path)
+    return SkillMatcher((skill for skill, _ in rows), tokenize=tokenize, categories=rows,
+                        aliases=read_aliases(path))
+
+def read_artifact(artifact, version):
+    """The object stored in an artifact written for version, else None
+
+    The version is pickled ahead of the object, so a stale artifact is
+    rejected before its object (whose classes may have changed) is loaded.
+    """
+    try:
+        with open(artifact, "rb") as f:
+            if pickle.load(f) != version:
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+            IndexError, TypeError, ValueError):
+        return None
+
+def write_artifact(artifact, version, obj):
+    """Atomically replace an artifact; failure (e.g. a read-only folder) is only logged"""
+    tmp = f"{artifact}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(version, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, artifact)
+    except OSError as e:
+        log.warning("could not save %s, rebuilding on next start: %s", artifact, e)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+def load_matcher(path=TAXONOMY_PATH, tokenize=default_tokenize, tokenizer_id="regex"):
+    """Return (matcher, version), loading the prebuilt artifact when it is current
+
+    The artifact is rebuilt (and atomically replaced) only when the taxonomy
+    file, MATCHER_FORMAT or the tokenizer changed. tokenizer_id must change
+    whenever tokenize would split text differently. If the artifact can't
+    be written the freshly built matcher is still returned.
+    """
+    version = taxonomy_version(path, tokenizer_id)
+    artifact = artifact_path(path, tokenizer_id)
+    matcher = read_artifact(artifact, version)
+    if matcher is None:
+        matcher = compile_taxonomy(path, tokenize)
+        write_artifact(artifact, version, matcher)
+    return matcher, version
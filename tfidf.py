@@ -0,0 +1,75 @@
+import os, json, hashlib
+import taxonomy
+
+# sklearn is imported when the vectorizer has to be (re)fitted or unpickled
+
+# Bump when the vectorizer settings below change (invalidates every artifact)
+TFIDF_FORMAT = "2"
+
+# Single-letter skills ("c", "r") are kept; unigrams and bigrams of skill words
+TOKEN_PATTERN = r"(?u)\b\w+\b"
+NGRAM_RANGE = (1, 2)
+
+# -------------------------------
+# Fit documents
+# -------------------------------
+def _corpus_documents(corpus):
+    """Joined lines of every record in an ingest.py corpus store"""
+    with open(corpus, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield "\n".join(json.loads(line)["lines"])
+            except (ValueError, KeyError):
+                continue
+
+def fit_documents(path=taxonomy.TAXONOMY_PATH, corpus=None):
+    """Every skill and alias as its own document, plus the corpus documents if given"""
+    docs = [skill for skill, _ in taxonomy.read_taxonomy(path)]
+    docs += [alias for alias, _ in taxonomy.read_aliases(path)]
+    if corpus is not None:
+        docs += list(_corpus_documents(corpus))
+    return docs
+
+# -------------------------------
+# Versioned artifact
+# -------------------------------
+def vectorizer_version(path=taxonomy.TAXONOMY_PATH, corpus=None):
+    """Hash of the taxonomy, the optional corpus, the settings and the sklearn version"""
+    import sklearn
+    h = hashlib.sha256(taxonomy.taxonomy_version(path, f"tfidf-{TFIDF_FORMAT}").encode())
+    if corpus is not None:
+        with open(corpus, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    h.update(f"|{TOKEN_PATTERN}|{NGRAM_RANGE}|{sklearn.__version__}".encode())
+    return h.hexdigest()[:16]
+
+def artifact_path(path=taxonomy.TAXONOMY_PATH, corpus=None):
+    tag = hashlib.sha1(os.path.abspath(corpus).encode()).hexdigest()[:8] if corpus else "taxonomy"
+    return f"{path}.{tag}.tfidf.pkl"
+
+def fit_vectorizer(path=taxonomy.TAXONOMY_PATH, corpus=None):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(token_pattern=TOKEN_PATTERN, ngram_range=NGRAM_RANGE)
+    return vectorizer.fit(fit_documents(path, corpus))
+
+def load_vectorizer(path=taxonomy.TAXONOMY_PATH, corpus=None):
+    """Return (vectorizer, version), loading the persisted fit when it is current
+
+    The vectorizer is fitted once over the taxonomy (and optionally an
+    ingest.py corpus store) and then only used with transform(), so the IDF
+    weights and therefore the similarity scores are stable across requests.
+    A stale or unreadable artifact is refitted; one that can't be written
+    is only logged.
+    """
+    version = vectorizer_version(path, corpus)
+    artifact = artifact_path(path, corpus)
+    vectorizer = taxonomy.read_artifact(artifact, version)
+    if vectorizer is None:
+        vectorizer = fit_vectorizer(path, corpus)
+        taxonomy.write_artifact(artifact, version, vectorizer)
+    return vectorizer, version
+
+def similarity(vectorizer, rows, columns):
+    """Dense cosine similarity of rows x columns skill strings (TF-IDF rows are L2-normalized)"""
+    return (vectorizer.transform(rows) @ vectorizer.transform(columns).T).toarray()